@@ -1,15 +1,17 @@
 import asyncio
 import os
 import sys
-import json
+import pickle
 import logging
+import orjson
 from contextlib import AsyncExitStack
 
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
 from langchain_mcp_adapters.tools import load_mcp_tools
-from langgraph.prebuilt import create_react_agent
+from langchain_core.messages import ToolMessage
+from langgraph.prebuilt import create_react_agent, ToolNode
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langgraph.checkpoint.memory import MemorySaver
 
@@ -62,11 +64,78 @@ Follow these guidelines:
    - Avoid simply repeating the raw data
 """
 
-class CustomEncoder(json.JSONEncoder):
-    def default(self, o):
-        if hasattr(o, "content"):
-            return {"type": o.__class__.__name__, "content": o.content}
-        return super().default(o)
+# Maximum number of tool calls dispatched concurrently in a single turn
+TOOL_CONCURRENCY_LIMIT = int(os.getenv("TOOL_CONCURRENCY_LIMIT", "8"))
+
+class ParallelToolNode(ToolNode):
+    """
+    ToolNode that runs all tool calls of a turn concurrently.
+    The default react agent dispatches tool calls one after another; for
+    I/O-bound MCP tools this node fans them out with asyncio.gather,
+    bounded by TOOL_CONCURRENCY_LIMIT.
+    """
+
+    def __init__(self, tools, **kwargs):
+        super().__init__(tools, **kwargs)
+        self._tool_map = {tool.name: tool for tool in tools}
+        self._semaphore = asyncio.Semaphore(TOOL_CONCURRENCY_LIMIT)
+
+    async def _invoke_tool(self, tool_call, config):
+        async with self._semaphore:
+            tool = self._tool_map.get(tool_call["name"])
+            if tool is None:
+                raise ValueError(f"Tool '{tool_call['name']}' not found")
+            # Forward the run config so callbacks and tracing keep working
+            return await tool.ainvoke(tool_call["args"], config)
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        messages = input.get("messages", []) if isinstance(input, dict) else input
+        last_message = messages[-1] if messages else None
+        tool_calls = getattr(last_message, "tool_calls", None)
+        if not tool_calls:
+            return await super().ainvoke(input, config, **kwargs)
+
+        results = await asyncio.gather(
+            *[self._invoke_tool(tool_call, config) for tool_call in tool_calls],
+            return_exceptions=True
+        )
+
+        tool_messages = []
+        for tool_call, result in zip(tool_calls, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Tool {tool_call['name']} failed: {result}")
+                # status='error' mirrors the stock ToolNode so the model can
+                # tell a failed call from a successful one
+                tool_messages.append(
+                    ToolMessage(
+                        content=f"Error: {result}",
+                        name=tool_call["name"],
+                        tool_call_id=tool_call["id"],
+                        status="error",
+                    )
+                )
+            else:
+                content = result if isinstance(result, str) else str(result)
+                tool_messages.append(
+                    ToolMessage(content=content, name=tool_call["name"], tool_call_id=tool_call["id"])
+                )
+        return {"messages": tool_messages}
+
+def encode_content(o):
+    """orjson default hook for message objects carrying a .content attribute."""
+    if hasattr(o, "content"):
+        return {"type": o.__class__.__name__, "content": o.content}
+    raise TypeError(f"Type is not JSON serializable: {type(o).__name__}")
+
+def resolve_env_placeholders(value):
+    """Recursively substitute ${{ENV_VAR}} placeholders in a config tree."""
+    if isinstance(value, dict):
+        return {key: resolve_env_placeholders(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve_env_placeholders(item) for item in value]
+    if isinstance(value, str) and value.startswith("${{") and value.endswith("}}"):
+        return os.getenv(value[3:-2], "")
+    return value
 
 def read_config_json():
     config_path = os.getenv("CONFIG_PATH")
@@ -77,15 +146,38 @@ def read_config_json():
         config_path = os.path.join(script_dir, "config.json")
         logger.info(f"Using default config path: {config_path}")
 
+    # Reuse a pre-resolved pickle of the config if the source file is unchanged,
+    # skipping JSON parsing and env-var substitution on startup.
+    cache_path = config_path + ".cache.pkl"
+    try:
+        mtime = os.path.getmtime(config_path)
+        if os.path.exists(cache_path):
+            with open(cache_path, "rb") as f:
+                cached_mtime, cached_config = pickle.load(f)
+            if cached_mtime == mtime:
+                logger.info(f"Loaded config from cache at {cache_path}")
+                return cached_config
+    except Exception as e:
+        logger.warning(f"Could not use config cache: {e}")
+        mtime = None
+
     try:
-        with open(config_path, "r") as f:
-            config = json.load(f)
+        with open(config_path, "rb") as f:
+            config = orjson.loads(f.read())
             logger.info(f"Successfully loaded config from {config_path}")
-            return config
     except Exception as e:
         logger.error(f"Failed to read config file at '{config_path}': {e}")
         sys.exit(1)
 
+    config = resolve_env_placeholders(config)
+    if mtime is not None:
+        try:
+            with open(cache_path, "wb") as f:
+                pickle.dump((mtime, config), f)
+        except Exception as e:
+            logger.warning(f"Could not write config cache: {e}")
+    return config
+
 def format_env(env):
     """
     Process environment variables in the configuration.
@@ -108,6 +200,82 @@ def format_env(env):
     print(processed_env, "processed_env")
     return processed_env
 
+async def open_server_session(server_name, server_info, stack):
+    """
+    Spawn a server process and enter its stdio and session contexts.
+    The MCP context managers hold anyio cancel scopes that must be exited
+    by the task that entered them, so this must run in the same task that
+    later unwinds the AsyncExitStack — never inside asyncio.gather.
+    """
+    logger.info(f"Connecting to MCP Server: {server_name}")
+
+    # Format the environment variables for this server
+    env_vars = format_env(server_info.get("env", {}))
+
+    # Debug what environment variables are being passed
+    logger.info(f"Environment variables for {server_name}: {list(env_vars.keys())}")
+
+    server_params = StdioServerParameters(
+        command=server_info["command"],
+        args=server_info["args"],
+        env=env_vars
+    )
+
+    read, write = await stack.enter_async_context(stdio_client(server_params))
+    return await stack.enter_async_context(ClientSession(read, write))
+
+async def initialize_server(server_name, session):
+    """
+    Initialize a session and return its tools. Enters no context managers,
+    so multiple sessions can be initialized concurrently via asyncio.gather.
+    """
+    logger.info(f"Initializing session with {server_name}")
+    await session.initialize()
+
+    logger.info(f"Loading tools from {server_name}")
+    server_tools = await load_mcp_tools(session)
+
+    for tool in server_tools:
+        logger.info(f"Loaded tool: {tool.name}")
+
+    logger.info(f"{len(server_tools)} tools loaded from {server_name}.")
+    return server_tools
+
+def _read_batch_queries(batch_path):
+    """Read newline-delimited queries from a file, skipping blank lines."""
+    try:
+        with open(batch_path, "r") as f:
+            return [line.strip() for line in f if line.strip()]
+    except Exception as e:
+        logger.error(f"Failed to read batch file '{batch_path}': {e}")
+        return []
+
+async def run_batch(agent, batch_path):
+    """
+    Run a file of queries concurrently via agent.abatch instead of one
+    ainvoke per REPL turn. Each query gets its own thread_id so
+    checkpointed histories stay separate.
+    """
+    queries = _read_batch_queries(batch_path)
+    if not queries:
+        logger.warning("No queries found for batch mode")
+        return
+
+    logger.info(f"Running {len(queries)} queries in batch mode")
+    inputs = [{"messages": query} for query in queries]
+    configs = [
+        {"configurable": {"thread_id": f"batch-{i}"}, "recursion_limit": 100, "max_concurrency": 8}
+        for i in range(len(queries))
+    ]
+    responses = await agent.abatch(inputs, config=configs, return_exceptions=True)
+
+    for query, response in zip(queries, responses):
+        print(f"\nQuery: {query}")
+        if isinstance(response, BaseException):
+            print(f"Error: {response}")
+        else:
+            print("Response:", response["messages"][-1].content if response.get("messages") else "No response")
+
 async def run_agent():
     config = read_config_json()
     mcp_servers = config.get("mcpServers", {})
@@ -136,48 +304,49 @@ async def run_agent():
         return
 
     async with AsyncExitStack() as stack:
+        # Enter each server's stdio/session contexts sequentially in this
+        # task (spawning the processes is cheap), then run the slow part —
+        # initialization handshakes and tool listing — concurrently, so
+        # startup time becomes the slowest handshake instead of the sum.
+        sessions = []
         for server_name, server_info in mcp_servers.items():
-            logger.info(f"Connecting to MCP Server: {server_name}")
-
-            # Format the environment variables for this server
-            env_vars = format_env(server_info.get("env", {}))
-            
-            # Debug what environment variables are being passed
-            logger.info(f"Environment variables for {server_name}: {list(env_vars.keys())}")
-            
-            server_params = StdioServerParameters(
-                command=server_info["command"],
-                args=server_info["args"],
-                env=env_vars
-            )
-
             try:
-                read, write = await stack.enter_async_context(stdio_client(server_params))
-                session = await stack.enter_async_context(ClientSession(read, write))
-                
-                logger.info(f"Initializing session with {server_name}")
-                await session.initialize()
-
-                logger.info(f"Loading tools from {server_name}")
-                server_tools = await load_mcp_tools(session)
+                session = await open_server_session(server_name, server_info, stack)
+            except Exception as e:
+                logger.error(f"Failed to start server {server_name}: {e}", exc_info=True)
+                continue
+            sessions.append((server_name, session))
 
-                for tool in server_tools:
-                    logger.info(f"Loaded tool: {tool.name}")
-                    tools.append(tool)
+        results = await asyncio.gather(
+            *[initialize_server(server_name, session) for server_name, session in sessions],
+            return_exceptions=True
+        )
 
-                logger.info(f"{len(server_tools)} tools loaded from {server_name}.")
-            except Exception as e:
-                logger.error(f"Failed to connect to server {server_name}: {e}", exc_info=True)
+        for (server_name, _), result in zip(sessions, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to connect to server {server_name}: {result}", exc_info=result)
+            else:
+                tools.extend(result)
 
         if not tools:
             logger.error("No tools loaded from any server. Exiting.")
             return
-        agent = create_react_agent(llm, tools, prompt=system_prompt, checkpointer=memory)    
+        agent = create_react_agent(llm, ParallelToolNode(tools), prompt=system_prompt, checkpointer=memory)
         logger.info("Agent created successfully with all tools")
 
+        if "--batch" in sys.argv:
+            flag_index = sys.argv.index("--batch")
+            if flag_index + 1 >= len(sys.argv):
+                logger.error("--batch requires a path to a query file")
+                return
+            await run_batch(agent, sys.argv[flag_index + 1])
+            return
+
         print("\n🚀 MCP Client Ready! Type 'quit' to exit.")
         while True:
-            query = input("\nQuery: ").strip()
+            # Read stdin in a worker thread so the event loop keeps servicing
+            # background MCP session reads while waiting for the user
+            query = (await asyncio.to_thread(input, "\nQuery: ")).strip()
             if query.lower() == "quit":
                 break
 
@@ -190,11 +359,36 @@ async def run_agent():
                 except Exception as e:
                     logger.error(f"Error processing query: {e}", exc_info=True)
                     print(f"Error: {e}")
-                response = await agent.ainvoke({"messages": query}, {"configurable": {"thread_id": "1"}, "recursion_limit": 100})
-
+                # Stream intermediate states so output appears as soon as
+                # each step finishes instead of after the whole chain
+                response = None
+                printed_messages = None
                 print("\nAgent Call Response:")
+                async for event in agent.astream(
+                    {"messages": query},
+                    {"configurable": {"thread_id": "1"}, "recursion_limit": 100},
+                    stream_mode="values"
+                ):
+                    response = event
+                    messages = event.get("messages", []) if isinstance(event, dict) else []
+                    if printed_messages is None:
+                        # The first values event replays the checkpointed
+                        # history plus the query just typed; only messages
+                        # appended after it belong to this turn.
+                        printed_messages = len(messages)
+                        continue
+                    for message in messages[printed_messages:]:
+                        content = getattr(message, "content", "")
+                        if content:
+                            print(f"[{message.__class__.__name__}] {content}")
+                    printed_messages = len(messages)
+
+                if response is None:
+                    print("No response")
+                    continue
+
                 try:
-                    formatted = json.dumps(response, indent=2, cls=CustomEncoder)
+                    formatted = orjson.dumps(response, default=encode_content, option=orjson.OPT_INDENT_2).decode()
                     print(formatted)
                     
                     print("\nResponse: ", response["messages"][-1].content if response.get("messages") else "No response")
@@ -1,8 +1,11 @@
 import asyncio
 import os
+import re
 import sys
-import json
+import pickle
 import logging
+import orjson
+from collections import deque
 from contextlib import AsyncExitStack
 from typing import List, Dict, Any
 
@@ -10,9 +13,9 @@ from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
 from langchain_mcp_adapters.tools import load_mcp_tools
-from langgraph.prebuilt import create_react_agent
+from langgraph.prebuilt import create_react_agent, ToolNode
 from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, ToolMessage
 from langchain_core.chat_history import BaseChatMessageHistory
 from langchain_core.runnables.history import RunnableWithMessageHistory
 
@@ -37,25 +40,86 @@ If you're not sure about something, be honest about your limitations.
 Always use this D://Python//2025//Personal_Ai_Agent//workspace as the root directory for all file operations.
 """
 
+# Maximum number of tool calls dispatched concurrently in a single turn
+TOOL_CONCURRENCY_LIMIT = int(os.getenv("TOOL_CONCURRENCY_LIMIT", "8"))
+
+class ParallelToolNode(ToolNode):
+    """
+    ToolNode that runs all tool calls of a turn concurrently.
+    The default react agent dispatches tool calls one after another; for
+    I/O-bound MCP tools this node fans them out with asyncio.gather,
+    bounded by TOOL_CONCURRENCY_LIMIT.
+    """
+
+    def __init__(self, tools, **kwargs):
+        super().__init__(tools, **kwargs)
+        self._tool_map = {tool.name: tool for tool in tools}
+        self._semaphore = asyncio.Semaphore(TOOL_CONCURRENCY_LIMIT)
+
+    async def _invoke_tool(self, tool_call, config):
+        async with self._semaphore:
+            tool = self._tool_map.get(tool_call["name"])
+            if tool is None:
+                raise ValueError(f"Tool '{tool_call['name']}' not found")
+            # Forward the run config so callbacks and tracing keep working
+            return await tool.ainvoke(tool_call["args"], config)
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        messages = input.get("messages", []) if isinstance(input, dict) else input
+        last_message = messages[-1] if messages else None
+        tool_calls = getattr(last_message, "tool_calls", None)
+        if not tool_calls:
+            return await super().ainvoke(input, config, **kwargs)
+
+        results = await asyncio.gather(
+            *[self._invoke_tool(tool_call, config) for tool_call in tool_calls],
+            return_exceptions=True
+        )
+
+        tool_messages = []
+        for tool_call, result in zip(tool_calls, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Tool {tool_call['name']} failed: {result}")
+                # status='error' mirrors the stock ToolNode so the model can
+                # tell a failed call from a successful one
+                tool_messages.append(
+                    ToolMessage(
+                        content=f"Error: {result}",
+                        name=tool_call["name"],
+                        tool_call_id=tool_call["id"],
+                        status="error",
+                    )
+                )
+            else:
+                content = result if isinstance(result, str) else str(result)
+                tool_messages.append(
+                    ToolMessage(content=content, name=tool_call["name"], tool_call_id=tool_call["id"])
+                )
+        return {"messages": tool_messages}
+
+# Upper bound on retained chat messages per session; keeps the prompt the
+# agent rebuilds each turn from growing without limit
+HISTORY_MAX = int(os.getenv("HISTORY_MAX", "64"))
+
 class InMemoryHistory(BaseChatMessageHistory):
     """Simple in-memory implementation of chat message history."""
-    
+
     def __init__(self):
-        self._messages = []
-    
+        self._messages = deque(maxlen=HISTORY_MAX)
+
     def add_message(self, message):
         self._messages.append(message)
-    
+
     def clear(self):
-        self._messages = []
+        self._messages.clear()
 
     @property
     def messages(self) -> List[Any]:
-        return self._messages
-        
+        return list(self._messages)
+
     @messages.setter
     def messages(self, messages: List[Any]):
-        self._messages = messages
+        self._messages = deque(messages, maxlen=HISTORY_MAX)
 
 class MessageHistoryStore:
     """Store for managing conversation histories."""
@@ -68,11 +132,21 @@ class MessageHistoryStore:
             self.histories[session_id] = InMemoryHistory()
         return self.histories[session_id]
 
-class CustomEncoder(json.JSONEncoder):
-    def default(self, o):
-        if hasattr(o, "content"):
-            return {"type": o.__class__.__name__, "content": o.content}
-        return super().default(o)
+def encode_content(o):
+    """orjson default hook for message objects carrying a .content attribute."""
+    if hasattr(o, "content"):
+        return {"type": o.__class__.__name__, "content": o.content}
+    raise TypeError(f"Type is not JSON serializable: {type(o).__name__}")
+
+def resolve_env_placeholders(value):
+    """Recursively substitute ${{ENV_VAR}} placeholders in a config tree."""
+    if isinstance(value, dict):
+        return {key: resolve_env_placeholders(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve_env_placeholders(item) for item in value]
+    if isinstance(value, str):
+        return format_string_with_env(value)
+    return value
 
 def read_config_json():
     config_path = os.getenv("CONFIG_PATH")
@@ -83,15 +157,41 @@ def read_config_json():
         config_path = os.path.join(script_dir, "config.json")
         logger.info(f"Using default config path: {config_path}")
 
+    # Reuse a pre-resolved pickle of the config if the source file is unchanged,
+    # skipping JSON parsing and env-var substitution on startup.
+    cache_path = config_path + ".cache.pkl"
+    try:
+        mtime = os.path.getmtime(config_path)
+        if os.path.exists(cache_path):
+            with open(cache_path, "rb") as f:
+                cached_mtime, cached_config = pickle.load(f)
+            if cached_mtime == mtime:
+                logger.info(f"Loaded config from cache at {cache_path}")
+                return cached_config
+    except Exception as e:
+        logger.warning(f"Could not use config cache: {e}")
+        mtime = None
+
     try:
-        with open(config_path, "r") as f:
-            config = json.load(f)
+        with open(config_path, "rb") as f:
+            config = orjson.loads(f.read())
             logger.info(f"Successfully loaded config from {config_path}")
-            return config
     except Exception as e:
         logger.error(f"Failed to read config file at '{config_path}': {e}")
         sys.exit(1)
 
+    config = resolve_env_placeholders(config)
+    if mtime is not None:
+        try:
+            with open(cache_path, "wb") as f:
+                pickle.dump((mtime, config), f)
+        except Exception as e:
+            logger.warning(f"Could not write config cache: {e}")
+    return config
+
+# Matches ${{ENV_VAR}} placeholders in config strings
+_ENV_RE = re.compile(r'\$\{\{(\w+)\}\}')
+
 def format_string_with_env(text):
     """
     Replace environment variable placeholders in a string.
@@ -99,21 +199,18 @@ def format_string_with_env(text):
     """
     if not isinstance(text, str):
         return text
-        
-    result = text
-    # Find all instances of ${{ENV_VAR}}
-    import re
-    matches = re.findall(r'\$\{\{(\w+)\}\}', text)
-    
-    for env_var_name in matches:
+
+    def replace(match):
+        env_var_name = match.group(1)
         env_var_value = os.getenv(env_var_name, "")
-        result = result.replace(f"${{{{{env_var_name}}}}}", env_var_value)
         if env_var_value:
             logger.info(f"Replaced ${{{{{env_var_name}}}}} with its environment value")
         else:
             logger.warning(f"Environment variable {env_var_name} not found")
-            
-    return result
+        return env_var_value
+
+    # Single pass over the string instead of findall plus one replace per match
+    return _ENV_RE.sub(replace, text)
 
 def format_env(env):
     """
@@ -138,6 +235,88 @@ def format_env(env):
     logger.debug(f"Processed environment variables: {processed_env}")
     return processed_env
 
+async def open_server_session(server_name, server_info, stack):
+    """
+    Spawn a server process and enter its stdio and session contexts.
+    The MCP context managers hold anyio cancel scopes that must be exited
+    by the task that entered them, so this must run in the same task that
+    later unwinds the AsyncExitStack — never inside asyncio.gather.
+    """
+    logger.info(f"Connecting to MCP Server: {server_name}")
+
+    # Format the environment variables for this server
+    env_vars = format_env(server_info.get("env", {}))
+
+    # Debug what environment variables are being passed
+    logger.info(f"Environment variables for {server_name}: {list(env_vars.keys())}")
+
+    server_params = StdioServerParameters(
+        command=server_info["command"],
+        args=server_info["args"],
+        env=env_vars
+    )
+
+    read, write = await stack.enter_async_context(stdio_client(server_params))
+    return await stack.enter_async_context(ClientSession(read, write))
+
+async def initialize_server(server_name, session):
+    """
+    Initialize a session and return its tools. Enters no context managers,
+    so multiple sessions can be initialized concurrently via asyncio.gather.
+    """
+    logger.info(f"Initializing session with {server_name}")
+    await session.initialize()
+
+    logger.info(f"Loading tools from {server_name}")
+    server_tools = await load_mcp_tools(session)
+
+    for tool in server_tools:
+        logger.info(f"Loaded tool: {tool.name}")
+
+    logger.info(f"{len(server_tools)} tools loaded from {server_name}.")
+    return server_tools
+
+def _read_batch_queries(batch_path):
+    """Read newline-delimited queries from a file, skipping blank lines."""
+    try:
+        with open(batch_path, "r") as f:
+            return [line.strip() for line in f if line.strip()]
+    except Exception as e:
+        logger.error(f"Failed to read batch file '{batch_path}': {e}")
+        return []
+
+async def run_batch(agent_with_memory, system_prompt, batch_path):
+    """
+    Run a file of queries concurrently via abatch instead of one ainvoke
+    per REPL turn. Each query gets its own session_id so histories stay
+    separate.
+    """
+    queries = _read_batch_queries(batch_path)
+    if not queries:
+        logger.warning("No queries found for batch mode")
+        return
+
+    logger.info(f"Running {len(queries)} queries in batch mode")
+    inputs = [
+        {
+            "messages": [SystemMessage(content=system_prompt), HumanMessage(content=query)],
+            "chat_history": []
+        }
+        for query in queries
+    ]
+    configs = [
+        {"configurable": {"session_id": f"batch-{i}"}, "max_concurrency": 8}
+        for i in range(len(queries))
+    ]
+    responses = await agent_with_memory.abatch(inputs, config=configs, return_exceptions=True)
+
+    for query, response in zip(queries, responses):
+        print(f"\nQuery: {query}")
+        if isinstance(response, BaseException):
+            print(f"Error: {response}")
+        else:
+            print("Response:", response["messages"][-1].content if response.get("messages") else "No response")
+
 async def run_agent():
     config = read_config_json()
     mcp_servers = config.get("mcpServers", {})
@@ -172,45 +351,36 @@ async def run_agent():
         return
 
     async with AsyncExitStack() as stack:
+        # Enter each server's stdio/session contexts sequentially in this
+        # task (spawning the processes is cheap), then run the slow part —
+        # initialization handshakes and tool listing — concurrently, so
+        # startup time becomes the slowest handshake instead of the sum.
+        sessions = []
         for server_name, server_info in mcp_servers.items():
-            logger.info(f"Connecting to MCP Server: {server_name}")
-
-            # Format the environment variables for this server
-            env_vars = format_env(server_info.get("env", {}))
-            
-            # Debug what environment variables are being passed
-            logger.info(f"Environment variables for {server_name}: {list(env_vars.keys())}")
-            
-            server_params = StdioServerParameters(
-                command=server_info["command"],
-                args=server_info["args"],
-                env=env_vars
-            )
-
             try:
-                read, write = await stack.enter_async_context(stdio_client(server_params))
-                session = await stack.enter_async_context(ClientSession(read, write))
-                
-                logger.info(f"Initializing session with {server_name}")
-                await session.initialize()
-
-                logger.info(f"Loading tools from {server_name}")
-                server_tools = await load_mcp_tools(session)
+                session = await open_server_session(server_name, server_info, stack)
+            except Exception as e:
+                logger.error(f"Failed to start server {server_name}: {e}", exc_info=True)
+                continue
+            sessions.append((server_name, session))
 
-                for tool in server_tools:
-                    logger.info(f"Loaded tool: {tool.name}")
-                    tools.append(tool)
+        results = await asyncio.gather(
+            *[initialize_server(server_name, session) for server_name, session in sessions],
+            return_exceptions=True
+        )
 
-                logger.info(f"{len(server_tools)} tools loaded from {server_name}.")
-            except Exception as e:
-                logger.error(f"Failed to connect to server {server_name}: {e}", exc_info=True)
+        for (server_name, _), result in zip(sessions, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to connect to server {server_name}: {result}", exc_info=result)
+            else:
+                tools.extend(result)
 
         if not tools:
             logger.error("No tools loaded from any server. Exiting.")
             return
 
         # Create the base agent
-        base_agent = create_react_agent(llm, tools)
+        base_agent = create_react_agent(llm, ParallelToolNode(tools))
         logger.info("Base agent created successfully with all tools")
         
         # Set up message history store
@@ -227,11 +397,25 @@ async def run_agent():
         
         logger.info("Agent wrapped with memory functionality")
 
+        if "--batch" in sys.argv:
+            flag_index = sys.argv.index("--batch")
+            if flag_index + 1 >= len(sys.argv):
+                logger.error("--batch requires a path to a query file")
+                return
+            await run_batch(agent_with_memory, system_prompt, sys.argv[flag_index + 1])
+            return
+
         print("\n🚀 MCP Client Ready! Type 'quit' to exit.")
         chat_history = []  # Initialize empty chat history
-        
+
+        # Identical every turn, so build them once outside the loop
+        system_message = SystemMessage(content=system_prompt)
+        session_config = {"configurable": {"session_id": session_id}}
+
         while True:
-            query = input("\nQuery: ").strip()
+            # Read stdin in a worker thread so the event loop keeps servicing
+            # background MCP session reads while waiting for the user
+            query = (await asyncio.to_thread(input, "\nQuery: ")).strip()
             if query.lower() == "quit":
                 break
             
@@ -247,32 +431,41 @@ async def run_agent():
                 # Prepare input with system prompt and history
                 input_data = {
                     "messages": [
-                        SystemMessage(content=system_prompt),
+                        system_message,
                         HumanMessage(content=query)
                     ],
                     "chat_history": chat_history
                 }
                 
-                # Invoke agent with memory
-                response = await agent_with_memory.ainvoke(
-                    input_data, 
-                    config={"configurable": {"session_id": session_id}}
-                )
-                
-                # Extract the response content for display
-                ai_response = response["messages"][-1].content if response.get("messages") else "No response"
-                
+                # Stream intermediate states so the answer starts printing
+                # before the whole chain completes
+                print("\nResponse:")
+                response = None
+                printed_messages = 0
+                async for event in agent_with_memory.astream(
+                    input_data,
+                    config=session_config,
+                    stream_mode="values"
+                ):
+                    response = event
+                    messages = event.get("messages", []) if isinstance(event, dict) else []
+                    for message in messages[printed_messages:]:
+                        content = getattr(message, "content", "")
+                        if isinstance(message, AIMessage) and content:
+                            print(content)
+                    printed_messages = len(messages)
+
+                # Extract the final response content from the last state
+                ai_response = response["messages"][-1].content if response and response.get("messages") else "No response"
+
                 # Update our tracking of chat history
                 chat_history.append(HumanMessage(content=query))
                 chat_history.append(AIMessage(content=ai_response))
-                
-                print("\nResponse:")
-                print(ai_response)
-                
+
                 # Optionally print full response details for debugging
                 if os.getenv("DEBUG") == "true":
                     try:
-                        formatted = json.dumps(response, indent=2, cls=CustomEncoder)
+                        formatted = orjson.dumps(response, default=encode_content, option=orjson.OPT_INDENT_2).decode()
                         print("\nDebug - Full response:")
                         print(formatted)
                     except Exception as e:
@@ -1,32 +1,39 @@
 import math
+import operator
 from mcp.server.fastmcp import FastMCP
 
 mcp = FastMCP("Calculator")
 
+# Cap on the bit length of a power result; anything larger is refused
+# instead of burning CPU and memory on a huge integer.
+MAX_POW_BITS = 100_000
+
 @mcp.tool()
 def add(a: int, b: int, **kwargs) -> int:
     """Add two numbers"""
-    return a + b
+    return operator.add(a, b)
 
 @mcp.tool()
 def subtract(a: int, b: int, **kwargs) -> int:
     """Subtract two numbers"""
-    return a - b
+    return operator.sub(a, b)
 
 @mcp.tool()
 def multiply(a: int, b: int, **kwargs) -> int:
     """Multiply two numbers"""
-    return a * b
+    return operator.mul(a, b)
 
 @mcp.tool()
 def divide(a: int, b: int, **kwargs) -> float:
     """Divide two numbers"""
-    return a / b
+    return operator.truediv(a, b)
 
 @mcp.tool()
 def power(a: int, b: int, **kwargs) -> int:
     """Raise a number to the power of another number"""
-    return a ** b
+    if b > 0 and a not in (0, 1, -1) and abs(a).bit_length() * b > MAX_POW_BITS:
+        raise ValueError("Result too large to compute")
+    return pow(a, b)
 
 if __name__ == "__main__":
     mcp.run(transport='stdio')
\ No newline at end of file
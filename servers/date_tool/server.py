@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta
+from functools import lru_cache
 from mcp.server.fastmcp import FastMCP
 import pytz
 from dataclasses import dataclass
@@ -7,6 +8,23 @@ from enum import Enum, auto
 
 mcp = FastMCP("Date Tool")
 
+@lru_cache(maxsize=128)
+def _tz(name: str):
+    """Resolve a timezone name once and reuse it across calls."""
+    return pytz.timezone(name)
+
+# Shared strftime format strings
+_DATE_FMT = "%Y-%m-%d"
+_TIME_FMT = "%H:%M:%S"
+_DATETIME_TZ_FMT = "%Y-%m-%d %H:%M:%S %Z"
+_WEEKDAY_FMT = "%A"
+_DEFAULT_INPUT_FMT = "%d/%m/%Y"
+_DEFAULT_OUTPUT_FMT = "%d %B %Y"
+
+# Warm strptime's internal regex cache for the default format so the first
+# format_date call does not pay the pattern build.
+datetime.strptime("01/01/1970", _DEFAULT_INPUT_FMT)
+
 class DateAction(Enum):
     CURRENT_DATE = "current_date"
     CURRENT_TIME = "current_time"
@@ -26,8 +44,8 @@ class AddDaysInput:
 @dataclass
 class FormatDateInput:
     date: str
-    input_format: str = "%d/%m/%Y"
-    output_format: str = "%d %B %Y"
+    input_format: str = _DEFAULT_INPUT_FMT
+    output_format: str = _DEFAULT_OUTPUT_FMT
 
 @dataclass
 class DateActionInput:
@@ -35,38 +53,38 @@ class DateActionInput:
     timezone: Optional[str] = "Asia/Kolkata"
     days: Optional[int] = None
     date: Optional[str] = None
-    input_format: Optional[str] = "%d/%m/%Y"
-    output_format: Optional[str] = "%d %B %Y"
+    input_format: Optional[str] = _DEFAULT_INPUT_FMT
+    output_format: Optional[str] = _DEFAULT_OUTPUT_FMT
 
 @mcp.tool()
 def get_current_date(input_data: TimezoneInput):
-    return datetime.now().strftime("%Y-%m-%d")
+    return datetime.now().strftime(_DATE_FMT)
 
 @mcp.tool()
 def get_current_time(input_data: TimezoneInput):
     """Get the current time in the specified timezone."""
-    tz = pytz.timezone(input_data.timezone)
-    return datetime.now(tz).strftime("%H:%M:%S")
+    tz = _tz(input_data.timezone)
+    return datetime.now(tz).strftime(_TIME_FMT)
 
 @mcp.tool()
 def get_time_in_timezone(input_data: TimezoneInput):
     """Get the current time in the specified timezone."""
-    tz = pytz.timezone(input_data.timezone)
-    return datetime.now(tz).strftime("%Y-%m-%d %H:%M:%S %Z")
+    tz = _tz(input_data.timezone)
+    return datetime.now(tz).strftime(_DATETIME_TZ_FMT)
 
 @mcp.tool()
 def day_of_week(input_data: TimezoneInput):
     """Get the current day of the week."""
-    tz = pytz.timezone(input_data.timezone)
-    return datetime.now(tz).strftime("%A")
+    tz = _tz(input_data.timezone)
+    return datetime.now(tz).strftime(_WEEKDAY_FMT)
 
 @mcp.tool()
 def add_days(input_data: AddDaysInput):
     """Add a specified number of days to the current date."""
-    tz = pytz.timezone(input_data.timezone)
+    tz = _tz(input_data.timezone)
     current_date = datetime.now(tz)
     new_date = current_date + timedelta(days=input_data.days)
-    return new_date.strftime("%Y-%m-%d")
+    return new_date.strftime(_DATE_FMT)
 
 @mcp.tool()
 def format_date(input_data: FormatDateInput):
@@ -77,37 +95,39 @@ def format_date(input_data: FormatDateInput):
     except ValueError as e:
         return f"Error parsing date: {str(e)}"
 
+def _add_days_action(input_data: DateActionInput):
+    if input_data.days is None:
+        return "Error: 'days' parameter is required for add_days action"
+    return add_days(AddDaysInput(days=input_data.days, timezone=input_data.timezone))
+
+def _format_date_action(input_data: DateActionInput):
+    if input_data.date is None:
+        return "Error: 'date' parameter is required for format_date action"
+    return format_date(FormatDateInput(
+        date=input_data.date,
+        input_format=input_data.input_format,
+        output_format=input_data.output_format
+    ))
+
+# Dispatch table: one dict lookup instead of a chain of enum comparisons
+_DISPATCH = {
+    DateAction.CURRENT_DATE: lambda d: get_current_date(TimezoneInput(timezone=d.timezone)),
+    DateAction.CURRENT_TIME: lambda d: get_current_time(TimezoneInput(timezone=d.timezone)),
+    DateAction.DAY_OF_WEEK: lambda d: day_of_week(TimezoneInput(timezone=d.timezone)),
+    DateAction.ADD_DAYS: _add_days_action,
+    DateAction.FORMAT_DATE: _format_date_action,
+}
+
 @mcp.tool()
 def process_date_action(input_data: DateActionInput):
     """
         Process different date actions based on the schema.
         This function is used to process the date action based on the input data.
     """
-    if input_data.action == DateAction.CURRENT_DATE:
-        timezone_input = TimezoneInput(timezone=input_data.timezone)
-        return get_current_date(timezone_input)
-    elif input_data.action == DateAction.CURRENT_TIME:
-        timezone_input = TimezoneInput(timezone=input_data.timezone)
-        return get_current_time(timezone_input)
-    elif input_data.action == DateAction.DAY_OF_WEEK:
-        timezone_input = TimezoneInput(timezone=input_data.timezone)
-        return day_of_week(timezone_input)
-    elif input_data.action == DateAction.ADD_DAYS:
-        if input_data.days is None:
-            return "Error: 'days' parameter is required for add_days action"
-        add_days_input = AddDaysInput(days=input_data.days, timezone=input_data.timezone)
-        return add_days(add_days_input)
-    elif input_data.action == DateAction.FORMAT_DATE:
-        if input_data.date is None:
-            return "Error: 'date' parameter is required for format_date action"
-        format_date_input = FormatDateInput(
-            date=input_data.date,
-            input_format=input_data.input_format,
-            output_format=input_data.output_format
-        )
-        return format_date(format_date_input)
-    else:
+    handler = _DISPATCH.get(input_data.action)
+    if handler is None:
         return f"Unknown action: {input_data.action}"
+    return handler(input_data)
     
 @mcp.prompt()
 def date_tool_prompt(message: str):
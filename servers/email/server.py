@@ -1,14 +1,50 @@
 from dataclasses import dataclass
-from email.mime.application import MIMEApplication
 import os
 import smtplib
 import logging
+import threading
+from email import encoders
+from email.mime.base import MIMEBase
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from mcp.server.fastmcp import FastMCP
 
 mcp = FastMCP("Email Tool")
 
+# SMTP settings resolved once at import; the port is cast to int here
+# instead of being coerced on every connect.
+SMTP_SERVER = os.getenv("SMTP_SERVER")
+SMTP_PORT = int(os.getenv("SMTP_PORT") or 587)
+SMTP_USERNAME = os.getenv("SMTP_USERNAME")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
+
+# Persistent SMTP connection, reused across sends so the TCP connect,
+# STARTTLS handshake and login are paid once per process instead of per call.
+_smtp = None
+_smtp_lock = threading.Lock()
+
+def _get_smtp():
+    """
+    Return a live, authenticated SMTP connection, reconnecting if the
+    previous one has gone away. Must be called with _smtp_lock held.
+    """
+    global _smtp
+    if _smtp is not None:
+        try:
+            if _smtp.noop()[0] == 250:
+                return _smtp
+        except Exception:
+            logging.info("SMTP connection lost, reconnecting")
+        _smtp = None
+
+    server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT)
+    server.ehlo()
+    server.starttls()
+    server.ehlo()
+    server.login(SMTP_USERNAME, SMTP_PASSWORD)
+    _smtp = server
+    return _smtp
+
 @dataclass
 class EmailInput:
     """
@@ -30,15 +66,10 @@ def send_email(to: str, subject: str, body: str, is_html: bool = False):
         subject: The email subject line
         body: The email body content (plain text)
     """
-    smtp_server = os.getenv("SMTP_SERVER")
-    smtp_port = os.getenv("SMTP_PORT")
-    username = os.getenv("SMTP_USERNAME")
-    password = os.getenv("SMTP_PASSWORD")
-
     logging.info(f"Attempting to send email to {to}")
     try:
         msg = MIMEMultipart()
-        msg['From'] = username
+        msg['From'] = SMTP_USERNAME
         msg['To'] = to
         msg['Subject'] = subject
         if is_html:
@@ -46,13 +77,11 @@ def send_email(to: str, subject: str, body: str, is_html: bool = False):
         else:
             msg.attach(MIMEText(body, 'plain'))
 
-        server = smtplib.SMTP(smtp_server, smtp_port)
-        server.ehlo()
-        server.starttls()
-        server.ehlo()
-        server.login(username, password)
-        server.sendmail(username, to, msg.as_string())
-        server.quit()
+        with _smtp_lock:
+            server = _get_smtp()
+            # send_message streams via BytesGenerator instead of building
+            # the whole MIME payload as one string with as_string()
+            server.send_message(msg)
 
         logging.info(f"Email successfully sent to {to}")
         return {"status": "success", "message": f"Email sent to {to} with subject '{subject}'."}
@@ -68,35 +97,30 @@ def send_email_with_attachment(to: str, subject: str, body: str, is_html: bool =
     """
     Send an email with an attachment.
     """
-    smtp_server = os.getenv("SMTP_SERVER")
-    smtp_port = os.getenv("SMTP_PORT")
-    username = os.getenv("SMTP_USERNAME")
-    password = os.getenv("SMTP_PASSWORD")
-
     logging.info(f"Attempting to send email to {to}")
     try:
         msg = MIMEMultipart()
-        msg['From'] = username
+        msg['From'] = SMTP_USERNAME
         msg['To'] = to
         msg['Subject'] = subject
         if is_html:
             msg.attach(MIMEText(body, 'html'))
         else:
             msg.attach(MIMEText(body, 'plain'))
-        
+
         with open(attachment_path, 'rb') as attachment:
-            part = MIMEApplication(attachment.read(), Name=os.path.basename(attachment_path))
-            part['Content-Disposition'] = f'attachment; filename="{os.path.basename(attachment_path)}"'
+            part = MIMEBase('application', 'octet-stream')
+            part.set_payload(attachment.read())
+            encoders.encode_base64(part)
+            part.add_header('Content-Disposition', f'attachment; filename="{os.path.basename(attachment_path)}"')
             msg.attach(part)
-            
-        server = smtplib.SMTP(smtp_server, smtp_port)
-        server.ehlo()
-        server.starttls()
-        server.ehlo()
-        server.login(username, password)
-        server.sendmail(username, to, msg.as_string())
-        server.quit()
-        
+
+        with _smtp_lock:
+            server = _get_smtp()
+            # send_message streams via BytesGenerator instead of building
+            # the whole MIME payload as one string with as_string()
+            server.send_message(msg)
+
         logging.info(f"Email successfully sent to {to}")
         return {"status": "success", "message": f"Email sent to {to} with subject '{subject}'."}
     except Exception as e:
@@ -1,7 +1,11 @@
 from dataclasses import dataclass
+from functools import lru_cache
+import asyncio
 import logging
 import os
-import requests
+import time
+import httpx
+import orjson
 import pint
 from mcp.server.fastmcp import FastMCP
 
@@ -9,6 +13,49 @@ mcp = FastMCP("Unit Conversion Tool")
 
 ureg = pint.UnitRegistry()
 
+@lru_cache(maxsize=256)
+def _unit(name: str):
+    """Parse a unit string once; pint's grammar walk is slow on repeats."""
+    return ureg(name)
+
+# Shared async client: keeps the connection (and TLS session) alive across calls
+_client = httpx.AsyncClient(timeout=10)
+
+def _jsonify(payload):
+    """Serialize a tool result with orjson so FastMCP ships the string as-is."""
+    return orjson.dumps(payload).decode()
+
+# Exchange rates change at most hourly, so cache the full conversion_rates
+# dict per base currency instead of hitting the API on every call.
+_rate_cache = {}
+_rate_cache_lock = asyncio.Lock()
+_CACHE_TTL = 3600
+
+async def _get_rates(api_key, from_currency):
+    """Return conversion rates for a base currency, cached for _CACHE_TTL seconds."""
+    entry = _rate_cache.get(from_currency)
+    if entry and time.time() - entry[0] < _CACHE_TTL:
+        return entry[1]
+
+    BASE_URL = f"https://v6.exchangerate-api.com/v6/{api_key}/latest/{from_currency}"
+    logging.info(f"Fetching currency rates for {from_currency}...")
+
+    try:
+        response = await _client.get(BASE_URL)
+        response.raise_for_status()
+    except httpx.HTTPStatusError as e:
+        logging.error(f"ExchangeRate API returned {e.response.status_code}")
+        return None
+
+    # Parse only after the status check so error payloads are never decoded
+    data = response.json()
+    if "conversion_rates" not in data:
+        return None
+
+    async with _rate_cache_lock:
+        _rate_cache[from_currency] = (time.time(), data["conversion_rates"])
+    return data["conversion_rates"]
+
 @dataclass
 class ConversionInput:
     """
@@ -26,7 +73,7 @@ class ConversionInput:
     to_currency: str = None
 
 @mcp.tool()
-def convert(input_data: ConversionInput):
+async def convert(input_data: ConversionInput):
     """
     Convert between units or currencies.
 
@@ -36,58 +83,53 @@ def convert(input_data: ConversionInput):
     """
     api_key = os.getenv("EXCHANGERATE_API_KEY")
     if not api_key:
-        return {"status": "error", "message": "ExchangeRate API key is required."}
+        return _jsonify({"status": "error", "message": "ExchangeRate API key is required."})
     try:
         if input_data.from_unit and input_data.to_unit:
             value = input_data.value
             from_unit = input_data.from_unit.strip().lower()
             to_unit = input_data.to_unit.strip().lower()
 
-            converted = (value * ureg(from_unit)).to(to_unit)
+            converted = (value * _unit(from_unit)).to(_unit(to_unit))
 
-            return {
+            return _jsonify({
                 "status": "success",
                 "message": f"Converted {value} {from_unit} to {converted.magnitude} {to_unit}",
                 "original_value": value,
                 "original_unit": from_unit,
                 "converted_value": converted.magnitude,
                 "converted_unit": to_unit
-            }
+            })
 
         elif input_data.from_currency and input_data.to_currency:
             value = input_data.value
             from_currency = input_data.from_currency.strip().upper()
             to_currency = input_data.to_currency.strip().upper()
 
-            BASE_URL = f"https://v6.exchangerate-api.com/v6/{api_key}/latest/{from_currency}"
-            logging.info(f"Fetching currency rate for {from_currency} to {to_currency}...")
-
-            response = requests.get(BASE_URL)
-            data = response.json()
-
-            if response.status_code == 200 and "conversion_rates" in data:
-                rate = data["conversion_rates"].get(to_currency)
-                if rate:
-                    converted_value = round(value * rate, 2)
-                    return {
-                        "status": "success",
-                        "message": f"Converted {value} {from_currency} to {converted_value} {to_currency}",
-                        "original_value": value,
-                        "original_currency": from_currency,
-                        "converted_value": converted_value,
-                        "converted_currency": to_currency
-                    }
-                else:
-                    return {"status": "error", "message": f"No conversion rate for {to_currency}."}
+            rates = await _get_rates(api_key, from_currency)
+            if rates is None:
+                return _jsonify({"status": "error", "message": "Failed to fetch currency data."})
+
+            rate = rates.get(to_currency)
+            if rate:
+                converted_value = round(value * rate, 2)
+                return _jsonify({
+                    "status": "success",
+                    "message": f"Converted {value} {from_currency} to {converted_value} {to_currency}",
+                    "original_value": value,
+                    "original_currency": from_currency,
+                    "converted_value": converted_value,
+                    "converted_currency": to_currency
+                })
             else:
-                return {"status": "error", "message": "Failed to fetch currency data."}
+                return _jsonify({"status": "error", "message": f"No conversion rate for {to_currency}."})
 
         else:
-            return {"status": "error", "message": "Please provide either unit or currency conversion fields."}
+            return _jsonify({"status": "error", "message": "Please provide either unit or currency conversion fields."})
 
     except Exception as e:
         logging.error(f"Error in conversion: {e}")
-        return {"status": "error", "message": f"Conversion failed: {str(e)}"}
+        return _jsonify({"status": "error", "message": f"Conversion failed: {str(e)}"})
 
 
 if __name__ == "__main__":
@@ -1,11 +1,24 @@
 from dataclasses import dataclass
 import os
-import requests
+import httpx
+import orjson
 import logging
 from mcp.server.fastmcp import FastMCP
 
 mcp = FastMCP("Weather Tool")
 
+# Shared async client: keeps the connection (and TLS session) alive across calls
+_client = httpx.AsyncClient(timeout=10)
+
+# Resolved once at import instead of on every call
+API_KEY = os.getenv("OPENWEATHERMAP_API_KEY")
+BASE_URL = "https://api.openweathermap.org/data/2.5/weather"
+
+def _jsonify(payload):
+    """Serialize a tool result with orjson so FastMCP ships the string as-is."""
+    return orjson.dumps(payload).decode()
+
+
 @dataclass
 class WeatherInput:
     """
@@ -19,16 +32,14 @@ class WeatherInput:
     units: str = "metric"
 
 @mcp.tool()
-def get_weather(input_data: WeatherInput):
+async def get_weather(input_data: WeatherInput):
     """
     Retrieve current weather information from OpenWeatherMap API.
     Provide either a city name or latitude and longitude.
     """
-    API_KEY = os.getenv("OPENWEATHERMAP_API_KEY")
     if not API_KEY:
-        return {"status": "error", "message": "Weather API key is required."}
-        
-    base_url = "https://api.openweathermap.org/data/2.5/weather"
+        return _jsonify({"status": "error", "message": "Weather API key is required."})
+
     query_params = {
         "appid": API_KEY,
         "units": input_data.units
@@ -40,10 +51,10 @@ def get_weather(input_data: WeatherInput):
         query_params["lat"] = input_data.lat
         query_params["lon"] = input_data.lon
     else:
-        return {"status": "error", "message": "Provide a city name or latitude/longitude coordinates."}
+        return _jsonify({"status": "error", "message": "Provide a city name or latitude/longitude coordinates."})
     
     try:
-        response = requests.get(base_url, params=query_params)
+        response = await _client.get(BASE_URL, params=query_params)
         response.raise_for_status()
         data = response.json()
         weather_info = {
@@ -58,20 +69,20 @@ def get_weather(input_data: WeatherInput):
             "units": input_data.units
         }
         logging.info(f"Weather fetched for {weather_info.get('location')}")
-        return weather_info
-    except requests.exceptions.HTTPError as e:
+        return _jsonify(weather_info)
+    except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
             logging.warning("Location not found.")
-            return {"status": "error", "message": "Location not found."}
+            return _jsonify({"status": "error", "message": "Location not found."})
         elif e.response.status_code == 401:
             logging.error("Authentication failed for weather API.")
-            return {"status": "error", "message": "Weather API authentication failed."}
+            return _jsonify({"status": "error", "message": "Weather API authentication failed."})
         else:
             logging.error(f"HTTP error: {e}")
-            return {"status": "error", "message": f"Weather API error: {e}"}
+            return _jsonify({"status": "error", "message": f"Weather API error: {e}"})
     except Exception as e:
         logging.error(f"Unexpected error: {e}")
-        return {"status": "error", "message": f"Unexpected error: {e}"}
+        return _jsonify({"status": "error", "message": f"Unexpected error: {e}"})
 
 if __name__ == "__main__":
     mcp.run(transport='stdio')
\ No newline at end of file
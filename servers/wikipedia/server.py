@@ -1,25 +1,289 @@
+import asyncio
+import atexit
 import logging
-import wikipedia
+import os
+import re
+import threading
+import aiohttp
+import orjson
+from functools import partial
+from urllib.parse import quote_from_bytes
+from cachetools import TTLCache
 from dataclasses import dataclass
+from itertools import islice
 from mcp.server.fastmcp import FastMCP
 
 mcp = FastMCP("Wikipedia Tool")
 
+logger = logging.getLogger(__name__)
+
+API_URL = "https://en.wikipedia.org/w/api.php"
+REST_SUMMARY_URL = "https://en.wikipedia.org/api/rest_v1/page/summary/"
+REST_PLAIN_URL = "https://en.wikipedia.org/api/rest_v1/page/plain/"
+
+# Percent-encode page titles for the REST URLs; quote_from_bytes skips the
+# str/bytes sniffing quote() does on every call, and safe= is bound once.
+_quote = partial(quote_from_bytes, safe=b"")
+
+# Splits extracts on sentence boundaries when trimming summaries
+_SENTENCE_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Successful responses are cached in-process so repeated queries skip the
+# HTTPS round-trip entirely; entries expire after WIKI_CACHE_TTL seconds.
+WIKI_CACHE_SIZE = int(os.getenv("WIKI_CACHE_SIZE", "512"))
+WIKI_CACHE_TTL = int(os.getenv("WIKI_CACHE_TTL", "3600"))
+
+_cache = TTLCache(maxsize=WIKI_CACHE_SIZE, ttl=WIKI_CACHE_TTL)
+_cache_lock = threading.Lock()
+
+# Missing or ambiguous titles are remembered briefly in a separate cache so
+# agent loops that retry them skip the network without evicting good entries.
+WIKI_NEG_CACHE_TTL = int(os.getenv("WIKI_NEG_CACHE_TTL", "60"))
+
+_neg_cache = TTLCache(maxsize=512, ttl=WIKI_NEG_CACHE_TTL)
+
+# Single-flight map: concurrent identical requests share one upstream fetch.
+# The first caller creates a Future, the rest await it.
+_inflight = {}
+_inflight_lock = asyncio.Lock()
+
+def _jsonify(payload):
+    """Serialize a tool result with orjson so FastMCP ships the string as-is."""
+    return orjson.dumps(payload).decode()
+
+# Shared aiohttp session with a bounded keep-alive pool, created lazily on
+# the first request so it binds to the running event loop.
+_session = None
+_session_lock = asyncio.Lock()
+
+async def _get_session():
+    global _session
+    if _session is None or _session.closed:
+        async with _session_lock:
+            if _session is None or _session.closed:
+                _session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=30),
+                    headers={"User-Agent": "Personal-AI-Agent-Wikipedia-MCP/1.0"},
+                    timeout=aiohttp.ClientTimeout(total=10),
+                )
+    return _session
+
+def _close_session():
+    if _session is not None and not _session.closed:
+        try:
+            asyncio.run(_session.close())
+        except RuntimeError:
+            pass
+
+atexit.register(_close_session)
+
+async def _api_get(params):
+    """Issue a GET against the MediaWiki API and return the decoded JSON."""
+    session = await _get_session()
+    async with session.get(API_URL, params=params) as response:
+        response.raise_for_status()
+        return await response.json()
+
+def _range_is_partial(content_range):
+    """True if a Content-Range header ('bytes 0-1023/45678') stops short of the total."""
+    try:
+        span, _, total = content_range.removeprefix("bytes ").partition("/")
+        end = int(span.split("-")[1])
+        return total == "*" or end + 1 < int(total)
+    except (ValueError, IndexError):
+        return True
+
+async def _rest_full_article(query, max_chars=None):
+    """
+    Stream the plain-text rendering of an article from the REST endpoint.
+    The response arrives gzip-compressed and is decompressed chunk by chunk
+    by aiohttp; chunks are joined exactly once instead of materializing the
+    article several times. When max_chars is set, a Range header stops the
+    transfer early. Returns a (content, truncated) pair, or None if the
+    page does not exist; truncated means part of the article was cut off.
+    """
+    session = await _get_session()
+    url = REST_PLAIN_URL + _quote(query.encode("utf-8"))
+    headers = {
+        "Accept": 'text/plain; charset=utf-8; profile="https://www.mediawiki.org/wiki/Specs/plain/1.0.0"',
+    }
+    if max_chars is not None and max_chars > 0:
+        headers["Range"] = f"bytes=0-{max_chars - 1}"
+    async with session.get(url, headers=headers) as response:
+        if response.status == 404:
+            return None
+        response.raise_for_status()
+        # A 206 means the server honored the Range; Content-Range says
+        # whether the slice actually stops short of the full article
+        truncated = (
+            response.status == 206
+            and _range_is_partial(response.headers.get("Content-Range", ""))
+        )
+        chunks = []
+        async for chunk in response.content.iter_chunked(65536):
+            chunks.append(chunk)
+    content = b"".join(chunks).decode("utf-8", errors="ignore")
+    if max_chars is not None and max_chars > 0 and len(content) > max_chars:
+        # The server ignored the Range header; enforce the cap client-side
+        content = content[:max_chars]
+        truncated = True
+    return content, truncated
+
+async def _rest_summary(query, sentences=3):
+    """
+    Fetch a page summary from the REST summary endpoint — a ~2KB JSON with
+    the extract already truncated by Wikipedia — instead of downloading and
+    parsing the whole article. Returns a ready-to-serve result dict.
+    """
+    session = await _get_session()
+    url = REST_SUMMARY_URL + _quote(query.encode("utf-8"))
+    async with session.get(url, headers={"Accept": "application/json"}) as response:
+        if response.status == 404:
+            return {"status": "error", "message": f"No Wikipedia page found for '{query}'."}
+        response.raise_for_status()
+        data = await response.json()
+
+    if data.get("type") == "disambiguation":
+        options = await _opensearch(query)
+        return {
+            "status": "error",
+            "message": f"Query '{query}' is ambiguous. Suggestions: {', '.join(islice(options, 5))}"
+        }
+
+    extract = data.get("extract", "")
+    return {
+        "status": "success",
+        "message": "Wikipedia summary retrieved.",
+        "title": data.get("title", query),
+        "summary": " ".join(_SENTENCE_RE.split(extract)[:sentences])
+    }
+
+async def _opensearch(query, limit=5):
+    """Return up to `limit` matching page titles for a search term."""
+    data = await _api_get({
+        "action": "opensearch",
+        "search": query,
+        "limit": limit,
+        "format": "json",
+    })
+    return data[1] if len(data) > 1 else []
+
+async def _do_summary(query):
+    return await _rest_summary(query)
+
+async def _do_full_article(query, max_chars=None):
+    article = await _rest_full_article(query, max_chars)
+    if article is None:
+        return {"status": "error", "message": f"No Wikipedia page found for '{query}'."}
+    content, truncated = article
+    result = {
+        "status": "success",
+        "message": "Wikipedia full article retrieved.",
+        "title": query,
+        "content": content
+    }
+    if truncated:
+        result["truncated"] = True
+    return result
+
+async def _do_search(query):
+    search_results = await _opensearch(query)
+    if not search_results:
+        return {"status": "error", "message": f"No Wikipedia search results for '{query}'."}
+    return {
+        "status": "success",
+        "message": "Wikipedia search results retrieved.",
+        "results": search_results
+    }
+
+async def _do_search_with_summaries(query):
+    search_results = await _opensearch(query)
+    if not search_results:
+        return {"status": "error", "message": f"No Wikipedia search results for '{query}'."}
+
+    # Fan the summary lookups out over the shared pool: the whole action
+    # costs ~2 round-trips instead of 1 + one per matching title
+    summaries = await asyncio.gather(
+        *[_rest_summary(title) for title in search_results],
+        return_exceptions=True
+    )
+
+    results = []
+    for title, summary in zip(search_results, summaries):
+        if isinstance(summary, BaseException):
+            logger.error("Summary fetch failed for '%s': %s", title, summary)
+            continue
+        if summary.get("status") != "success":
+            continue
+        results.append({"title": summary.get("title", title), "summary": summary["summary"]})
+    return {
+        "status": "success",
+        "message": "Wikipedia search results with summaries retrieved.",
+        "results": results
+    }
+
+# Action dispatch: one dict lookup instead of a chain of string comparisons,
+# and a natural seam for per-action caching
+_HANDLERS = {
+    "summary": _do_summary,
+    "full_article": _do_full_article,
+    "search": _do_search,
+    "search_with_summaries": _do_search_with_summaries,
+}
+
 @dataclass
+class WikipediaBatchInput:
+    """
+    Provide multiple search queries to resolve in one tool call.
+    """
+    queries: list[str]  # e.g., ['Artificial Intelligence', 'Machine Learning']
+
+@mcp.tool()
+async def wikipedia_batch_search(input_data: WikipediaBatchInput) -> str:
+    """
+    Search Wikipedia for several terms in one call.
+    All lookups run concurrently over the shared connection pool, so a
+    batch costs roughly one round-trip instead of one per query.
+    """
+    queries = [query.strip() for query in input_data.queries if query and query.strip()]
+    if not queries:
+        return _jsonify({"status": "error", "message": "Parameter 'queries' is required."})
+
+    results = await asyncio.gather(
+        *[_opensearch(query) for query in queries],
+        return_exceptions=True
+    )
+
+    batch = {}
+    for query, result in zip(queries, results):
+        if isinstance(result, BaseException):
+            logger.error("Batch search failed for '%s': %s", query, result)
+            batch[query] = []
+        else:
+            batch[query] = result
+    return _jsonify({
+        "status": "success",
+        "message": "Wikipedia batch search results retrieved.",
+        "results": batch
+    })
+
+@dataclass(slots=True, frozen=True)
 class WikipediaInput:
     """
     Provide a Wikipedia action and query to retrieve information.
-    
+
     Actions:
     - 'summary': Get a brief summary (3 sentences)
     - 'full_article': Get full content of the article
     - 'search': Search for related topics
+    - 'search_with_summaries': Search and summarize each match
     """
-    action: str  # 'summary', 'full_article', or 'search'
+    action: str  # 'summary', 'full_article', 'search', or 'search_with_summaries'
     query: str   # e.g., 'Artificial Intelligence'
+    max_chars: int | None = None  # optional cap on full_article content size
 
 @mcp.tool()
-def wikipedia_tool(input_data: WikipediaInput) -> dict:
+async def wikipedia_tool(input_data: WikipediaInput) -> str:
     """
     Fetches information from Wikipedia based on the specified action.
     Supports summary retrieval, full article fetch, and topic search.
@@ -30,55 +294,74 @@ def wikipedia_tool(input_data: WikipediaInput) -> dict:
 
     if not query:
         error_msg = "Parameter 'query' is required."
-        logging.error(error_msg)
-        return {"status": "error", "message": error_msg}
+        logger.error("%s", error_msg)
+        return _jsonify({"status": "error", "message": error_msg})
 
-    try:
-        if action == "summary":
-            summary = wikipedia.summary(query, sentences=3)
-            return {
-                "status": "success",
-                "message": "Wikipedia summary retrieved.",
-                "title": query,
-                "summary": summary
-            }
-
-        elif action == "full_article":
-            page = wikipedia.page(query)
-            return {
-                "status": "success",
-                "message": "Wikipedia full article retrieved.",
-                "title": page.title,
-                "content": page.content
-            }
-
-        elif action == "search":
-            search_results = wikipedia.search(query, results=5)
-            if not search_results:
-                return {"status": "error", "message": f"No Wikipedia search results for '{query}'."}
-            return {
-                "status": "success",
-                "message": "Wikipedia search results retrieved.",
-                "results": search_results
-            }
+    cache_key = (action, query.casefold())
+    if action == "full_article" and input_data.max_chars is not None:
+        cache_key += (input_data.max_chars,)
+    with _cache_lock:
+        cached = _cache.get(cache_key) or _neg_cache.get(cache_key)
+    if cached is not None:
+        logger.info("Cache hit for %s '%s'", action, query)
+        return cached
 
-        else:
-            error_msg = "Invalid action. Use 'summary', 'full_article', or 'search'."
-            logging.error(error_msg)
-            return {"status": "error", "message": error_msg}
+    handler = _HANDLERS.get(action)
+    if handler is None:
+        error_msg = "Invalid action. Use 'summary', 'full_article', 'search', or 'search_with_summaries'."
+        logger.error("%s", error_msg)
+        return _jsonify({"status": "error", "message": error_msg})
 
-    except wikipedia.exceptions.PageError:
-        return {"status": "error", "message": f"No Wikipedia page found for '{query}'."}
+    # Single-flight: if an identical request is already in flight, await its
+    # result instead of issuing a duplicate upstream fetch.
+    async with _inflight_lock:
+        with _cache_lock:
+            cached = _cache.get(cache_key) or _neg_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        existing = _inflight.get(cache_key)
+        if existing is None:
+            future = asyncio.get_running_loop().create_future()
+            _inflight[cache_key] = future
+    if existing is not None:
+        return await existing
 
-    except wikipedia.exceptions.DisambiguationError as e:
-        return {
-            "status": "error",
-            "message": f"Query '{query}' is ambiguous. Suggestions: {', '.join(e.options[:5])}"
-        }
+    try:
+        try:
+            if action == "full_article":
+                result = await handler(query, input_data.max_chars)
+            else:
+                result = await handler(query)
+            payload = _jsonify(result)
+            if result["status"] != "success":
+                # Deterministic misses (missing/ambiguous titles, empty search)
+                # are negative-cached with the short TTL
+                with _cache_lock:
+                    _neg_cache[cache_key] = payload
+            else:
+                # Only successful lookups are cached; the serialized string is
+                # immutable, so hits can return it directly
+                with _cache_lock:
+                    _cache[cache_key] = payload
+
+        except asyncio.TimeoutError:
+            payload = _jsonify({"status": "error", "message": f"Wikipedia request timed out for '{query}'."})
+
+        except aiohttp.ClientError as e:
+            logger.exception("Wikipedia request failed: %s", e)
+            payload = _jsonify({"status": "error", "message": "An unexpected error occurred."})
 
-    except Exception as e:
-        logging.error(f"Unexpected error: {str(e)}")
-        return {"status": "error", "message": "An unexpected error occurred."}
+        future.set_result(payload)
+        return payload
+    except BaseException as exc:
+        # Anything that escapes the handlers above (cancellation, malformed
+        # upstream JSON, ...) must still resolve the future, or every waiter
+        # blocked on `await existing` would hang forever.
+        if not future.done():
+            future.set_exception(exc)
+        raise
+    finally:
+        _inflight.pop(cache_key, None)
 
 if __name__ == "__main__":
     mcp.run(transport="stdio")